@@ -1,3 +1,3 @@
-from .editor import file_editor
+from .editor import file_editor, file_editor_batch
 
-__all__ = ['file_editor']
+__all__ = ['file_editor', 'file_editor_batch']
@@ -1,11 +1,21 @@
 import json
+import os
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 
 from .editor import Command, OHEditor
 from .exceptions import ToolError
 from .results import ToolResult
 
-_GLOBAL_EDITOR = OHEditor()
+_GLOBAL_EDITOR: OHEditor | None = None
+
+
+def _get_editor() -> OHEditor:
+    """Return the process-wide editor, creating it on first use."""
+    global _GLOBAL_EDITOR
+    if _GLOBAL_EDITOR is None:
+        _GLOBAL_EDITOR = OHEditor()
+    return _GLOBAL_EDITOR
 
 
 def _make_api_tool_result(tool_result: ToolResult) -> str:
@@ -29,7 +39,7 @@ def file_editor(
 ) -> str:
     result: ToolResult | None = None
     try:
-        result = _GLOBAL_EDITOR(
+        result = _get_editor()(
             command=command,
             path=path,
             file_text=file_text,
@@ -47,3 +57,37 @@ def file_editor(
     return f"""<oh_aci_output_{marker_id}>
 {json.dumps(result.to_dict(extra_field={'formatted_output_and_error': formatted_output_and_error}), indent=2)}
 </oh_aci_output_{marker_id}>"""
+
+
+def file_editor_batch(calls: list[dict], max_workers: int | None = None) -> list[str]:
+    """Run several `file_editor` calls concurrently.
+
+    Args:
+        calls: Keyword arguments for each `file_editor` call. Calls on different
+            files run concurrently; calls on the same file run one after another,
+            in the order given.
+        max_workers: Maximum number of worker threads. If None, uses the
+            `ThreadPoolExecutor` default.
+
+    Returns:
+        The `file_editor` outputs, in the same order as `calls`.
+    """
+    # An edit reads the whole file and then rewrites it, so edits to one file
+    # must not interleave: group the calls by resolved path and give each group
+    # to a single worker.
+    groups: dict[str, list[int]] = {}
+    for index, kwargs in enumerate(calls):
+        groups.setdefault(os.path.realpath(kwargs['path']), []).append(index)
+
+    results: list[str] = [''] * len(calls)
+
+    def run_group(indices: list[int]) -> None:
+        for index in indices:
+            results[index] = file_editor(**calls[index])
+
+    # Create the shared editor up front so workers do not race to build it,
+    # and edits made in a batch can still be undone with `file_editor`.
+    _get_editor()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        list(executor.map(run_group, groups.values()))
+    return results
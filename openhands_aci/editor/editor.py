@@ -1,13 +1,13 @@
+import locale
 import mimetypes
 import os
-import re
 import shutil
+import stat
 import tempfile
 from pathlib import Path
 from typing import Literal, get_args
 
 from openhands_aci.linter import DefaultLinter
-from openhands_aci.utils.shell import run_shell_cmd
 
 from .config import SNIPPET_CONTEXT_WINDOW
 from .exceptions import (
@@ -29,6 +29,7 @@ Command = Literal[
     # 'jump_to_definition', TODO:
     # 'find_references' TODO:
 ]
+_ALLOWED_COMMANDS = ', '.join(get_args(Command))
 
 
 class OHEditor:
@@ -106,15 +107,26 @@ class OHEditor:
             return self.undo_edit(_path)
 
         raise ToolError(
-            f'Unrecognized command {command}. The allowed commands for the {self.TOOL_NAME} tool are: {", ".join(get_args(Command))}'
+            f'Unrecognized command {command}. The allowed commands for the {self.TOOL_NAME} tool are: {_ALLOWED_COMMANDS}'
         )
 
     def _count_lines(self, path: Path) -> int:
         """
         Count the number of lines in a file safely.
         """
-        with open(path) as f:
-            return sum(1 for _ in f)
+        num_lines = 0
+        last_chunk = b''
+        with open(path, 'rb', buffering=0) as f:
+            while chunk := f.read(1 << 16):
+                if b'\r' in chunk:
+                    # Let text mode handle universal newlines (`\r` and `\r\n`)
+                    with open(path) as text_file:
+                        return sum(1 for _ in text_file)
+                num_lines += chunk.count(b'\n')
+                last_chunk = chunk
+        if last_chunk and not last_chunk.endswith(b'\n'):
+            num_lines += 1
+        return num_lines
 
     def str_replace(
         self, path: Path, old_str: str, new_str: str | None, enable_linting: bool
@@ -127,37 +139,48 @@ class OHEditor:
         new_str = new_str.expandtabs() if new_str is not None else ''
 
         # Read the entire file first to handle both single-line and multi-line replacements
-        file_content = self.read_file(path).expandtabs()
-
-        # Find all occurrences using regex
-        # Escape special regex characters in old_str to match it literally
-        pattern = re.escape(old_str)
-        occurrences = [
-            (
-                file_content.count('\n', 0, match.start()) + 1,  # line number
-                match.group(),  # matched text
-                match.start(),  # start position
-            )
-            for match in re.finditer(pattern, file_content)
-        ]
+        raw_file_content = self.read_file(path)
+        file_content = raw_file_content.expandtabs()
 
-        if not occurrences:
+        # Locate the first occurrence; a second one makes the replacement ambiguous
+        idx = file_content.find(old_str)
+        if idx == -1:
             raise ToolError(
                 f'No replacement was performed, old_str `{old_str}` did not appear verbatim in {path}.'
             )
-        if len(occurrences) > 1:
-            line_numbers = [line for line, _, _ in occurrences]
+        # Occurrences do not overlap (an empty old_str still advances one character)
+        step = len(old_str) or 1
+        if file_content.find(old_str, idx + step) != -1:
+            line_numbers = []
+            line_number, counted_up_to = 1, 0
+            occurrence = idx
+            while occurrence != -1:
+                # Only count the newlines since the previous occurrence
+                line_number += file_content.count('\n', counted_up_to, occurrence)
+                counted_up_to = occurrence
+                line_numbers.append(line_number)
+                occurrence = file_content.find(old_str, occurrence + step)
             raise ToolError(
                 f'No replacement was performed. Multiple occurrences of old_str `{old_str}` in lines {line_numbers}. Please ensure it is unique.'
             )
 
         # We found exactly one occurrence
-        replacement_line, matched_text, idx = occurrences[0]
+        replacement_line = file_content.count('\n', 0, idx) + 1
 
         # Create new content by replacing just the matched text
         new_file_content = (
-            file_content[:idx] + new_str + file_content[idx + len(matched_text) :]
+            file_content[:idx] + new_str + file_content[idx + len(old_str) :]
         )
+        if new_file_content == raw_file_content:
+            # Expanding tabs can make the edit a no-op; skip the write and keep
+            # the unchanged content off the history
+            return CLIResult(
+                output=f'No changes were made to {path}: the edited content is identical to the current content.',
+                prev_exist=True,
+                path=str(path),
+                old_content=raw_file_content,
+                new_content=raw_file_content,
+            )
 
         # Write the new content to the file
         self.write_file(path, new_file_content)
@@ -169,8 +192,8 @@ class OHEditor:
         start_line = max(0, replacement_line - SNIPPET_CONTEXT_WINDOW)
         end_line = replacement_line + SNIPPET_CONTEXT_WINDOW + new_str.count('\n')
 
-        # Read just the snippet range
-        snippet = self.read_file(path, start_line=start_line, end_line=end_line)
+        # Take the snippet from the content we just wrote instead of re-reading the file
+        snippet = self._slice_lines(new_file_content, start_line, end_line)
 
         # Prepare the success message
         success_message = f'The file {path} has been edited. '
@@ -204,26 +227,18 @@ class OHEditor:
                     'The `view_range` parameter is not allowed when `path` points to a directory.',
                 )
 
-            # First count hidden files/dirs in current directory only
-            # -mindepth 1 excludes . and .. automatically
-            _, hidden_stdout, _ = run_shell_cmd(
-                rf"find -L {path} -mindepth 1 -maxdepth 1 -name '.*'"
-            )
-            hidden_count = (
-                len(hidden_stdout.strip().split('\n')) if hidden_stdout.strip() else 0
-            )
-
-            # Then get files/dirs up to 2 levels deep, excluding hidden entries at both depth 1 and 2
-            _, stdout, stderr = run_shell_cmd(
-                rf"find -L {path} -maxdepth 2 -not \( -path '{path}/\.*' -o -path '{path}/*/\.*' \) | sort",
+            # Walk the directory in-process instead of shelling out to `find`
+            paths, dir_paths, hidden_count, errors = self._list_directory(path)
+            stdout = maybe_truncate(
+                '\n'.join(sorted(paths)),
                 truncate_notice=DIRECTORY_CONTENT_TRUNCATED_NOTICE,
             )
+            stderr = maybe_truncate('\n'.join(errors))
             if not stderr:
                 # Add trailing slashes to directories
-                paths = stdout.strip().split('\n') if stdout.strip() else []
                 formatted_paths = []
-                for p in paths:
-                    if Path(p).is_dir():
+                for p in stdout.split('\n'):
+                    if p in dir_paths:
                         formatted_paths.append(f'{p}/')
                     else:
                         formatted_paths.append(p)
@@ -244,9 +259,7 @@ class OHEditor:
                 prev_exist=True,
             )
 
-        # Validate file and count lines
         self.validate_file(path)
-        num_lines = self._count_lines(path)
 
         start_line = 1
         if not view_range:
@@ -257,6 +270,9 @@ class OHEditor:
                 prev_exist=True,
             )
 
+        # Only a ranged view needs the line count, to validate the range
+        num_lines = self._count_lines(path)
+
         if len(view_range) != 2 or not all(isinstance(i, int) for i in view_range):
             raise EditorToolParameterInvalidError(
                 'view_range',
@@ -296,13 +312,53 @@ class OHEditor:
             prev_exist=True,
         )
 
+    def _list_directory(self, path: Path) -> tuple[list[str], set[str], int, list[str]]:
+        """
+        List the non-hidden entries of a directory up to 2 levels deep, following symlinks like `find -L`.
+
+        Returns:
+            The listed paths (including `path` itself), the subset of them that are
+            directories, the number of hidden entries directly inside `path`, and
+            error messages for directories that could not be read.
+        """
+        paths = [str(path)]
+        dir_paths = {str(path)}
+        hidden_count = 0
+        errors = []
+        # Directory entries cache their type, so no extra stat is needed per path
+        to_scan = [(str(path), 1)]
+        while to_scan:
+            dir_path, depth = to_scan.pop()
+            try:
+                with os.scandir(dir_path) as it:
+                    for entry in it:
+                        if entry.name.startswith('.'):
+                            if depth == 1:
+                                hidden_count += 1
+                            continue
+                        paths.append(entry.path)
+                        if entry.is_dir():
+                            dir_paths.add(entry.path)
+                            if depth < 2:
+                                to_scan.append((entry.path, depth + 1))
+            except OSError as e:
+                errors.append(f"Cannot read directory '{dir_path}': {e.strerror}")
+        return paths, dir_paths, hidden_count, errors
+
     def write_file(self, path: Path, file_text: str) -> None:
         """
         Write the content of a file to a given path; raise a ToolError if an error occurs.
         """
         self.validate_file(path)
         try:
-            path.write_text(file_text)
+            if os.linesep != '\n':
+                # Keep the newline translation text mode would have applied
+                file_text = file_text.replace('\n', os.linesep)
+            data = memoryview(file_text.encode(locale.getpreferredencoding(False)))
+            # Write the encoded content unbuffered; raw writes may be partial
+            with open(path, 'wb', buffering=0) as f:
+                while data:
+                    data = data[f.write(data) :]
         except Exception as e:
             raise ToolError(f'Ran into {e} while trying to write to {path}') from None
 
@@ -326,47 +382,37 @@ class OHEditor:
         new_str = new_str.expandtabs()
         new_str_lines = new_str.split('\n')
 
-        # Create temporary file for the new content
+        # Copy the file into a temporary file in a single pass, inserting the new
+        # lines along the way and keeping both versions in memory for history
+        # and the result
+        history_lines: list[str] = []
+        new_lines: list[str] = []
+        inserted_lines = [line + '\n' for line in new_str_lines]
         with tempfile.NamedTemporaryFile(mode='w', delete=False) as temp_file:
-            # Copy lines before insert point and save them for history
-            history_lines = []
-            with open(path, 'r') as f:
-                for i, line in enumerate(f, 1):
-                    if i > insert_line:
-                        break
-                    temp_file.write(line.expandtabs())
-                    history_lines.append(line)
-
-            # Insert new content
-            for line in new_str_lines:
-                temp_file.write(line + '\n')
-
-            # Copy remaining lines and save them for history
+            if insert_line == 0:
+                new_lines.extend(inserted_lines)
             with open(path, 'r') as f:
                 for i, line in enumerate(f, 1):
-                    if i <= insert_line:
-                        continue
-                    temp_file.write(line.expandtabs())
                     history_lines.append(line)
+                    new_lines.append(line.expandtabs())
+                    if i == insert_line:
+                        new_lines.extend(inserted_lines)
+            temp_file.writelines(new_lines)
 
         # Move temporary file to original location
         shutil.move(temp_file.name, path)
 
-        # Read just the snippet range
         start_line = max(1, insert_line - SNIPPET_CONTEXT_WINDOW)
         end_line = min(
             num_lines + len(new_str_lines),
             insert_line + SNIPPET_CONTEXT_WINDOW + len(new_str_lines),
         )
-        snippet = self.read_file(path, start_line=start_line, end_line=end_line)
+        new_file_text = ''.join(new_lines)
+        snippet = self._slice_lines(new_file_text, start_line, end_line)
 
-        # Save history - we already have the lines in memory
         file_text = ''.join(history_lines)
         self._history_manager.add_history(path, file_text)
 
-        # Read new content for result
-        new_file_text = self.read_file(path)
-
         success_message = f'The file {path} has been edited. '
         success_message += self._make_output(
             snippet,
@@ -400,20 +446,28 @@ class OHEditor:
                 path,
                 f'The path should be an absolute path, starting with `/`. Maybe you meant {suggested_path}?',
             )
+        # Stat the path once and derive existence and type from the result
+        try:
+            path_stat: os.stat_result | None = os.stat(path)
+        except (OSError, ValueError):
+            path_stat = None
+        path_exists = path_stat is not None
+        path_is_dir = path_stat is not None and stat.S_ISDIR(path_stat.st_mode)
+
         # Check if path and command are compatible
-        if command == 'create' and path.exists():
+        if command == 'create' and path_exists:
             raise EditorToolParameterInvalidError(
                 'path',
                 path,
                 f'File already exists at: {path}. Cannot overwrite files using command `create`.',
             )
-        if command != 'create' and not path.exists():
+        if command != 'create' and not path_exists:
             raise EditorToolParameterInvalidError(
                 'path',
                 path,
                 f'The path {path} does not exist. Please provide a valid path.',
             )
-        if command != 'view' and path.is_dir():
+        if command != 'view' and path_is_dir:
             raise EditorToolParameterInvalidError(
                 'path',
                 path,
@@ -424,7 +478,7 @@ class OHEditor:
         """
         Implement the undo_edit command.
         """
-        current_text = self.read_file(path).expandtabs()
+        current_text = self.read_file(path)
         old_text = self._history_manager.get_last_history(path)
         if old_text is None:
             raise ToolError(f'No edit history found for {path}.')
@@ -449,11 +503,16 @@ class OHEditor:
         Raises:
             FileValidationError: If the file fails validation
         """
-        if not path.is_file():
+        # Stat the file once for both the type check and the size
+        try:
+            file_stat = os.stat(path)
+        except (OSError, ValueError):
+            return  # Skip validation for paths that cannot be stat'ed
+        if not stat.S_ISREG(file_stat.st_mode):
             return  # Skip validation for directories
 
         # Check file size
-        file_size = os.path.getsize(path)
+        file_size = file_stat.st_size
         max_size = self._max_file_size
         if file_size > max_size:
             raise FileValidationError(
@@ -514,12 +573,34 @@ class OHEditor:
                     'Both start_line and end_line must be provided together'
                 )
             else:
-                # Use line-by-line reading to avoid loading entire file into memory
-                with open(path, 'r') as f:
-                    return ''.join(f)
+                # Slurp the file with a single unbuffered read and decode it once
+                with open(path, 'rb', buffering=0) as f:
+                    text = f.read().decode(locale.getpreferredencoding(False))
+                if '\r' in text:
+                    # Apply the same universal newline translation as text mode
+                    text = text.replace('\r\n', '\n').replace('\r', '\n')
+                return text
         except Exception as e:
             raise ToolError(f'Ran into {e} while trying to read {path}') from None
 
+    def _slice_lines(self, text: str, start_line: int, end_line: int) -> str:
+        """
+        Return lines `start_line` to `end_line` (1-based, inclusive) of `text`, matching `read_file` on a range.
+        """
+        # Walk newline offsets instead of splitting the whole text into lines
+        start = 0
+        for _ in range(max(start_line, 1) - 1):
+            start = text.find('\n', start) + 1
+            if start == 0:
+                return ''
+        end = start
+        for _ in range(end_line - max(start_line, 1) + 1):
+            end = text.find('\n', end) + 1
+            if end == 0:
+                end = len(text)
+                break
+        return text[start:end]
+
     def _make_output(
         self,
         snippet_content: str,
@@ -536,10 +617,11 @@ class OHEditor:
         if expand_tabs:
             snippet_content = snippet_content.expandtabs()
 
+        # %-formatting the (number, line) pairs is measurably cheaper than an f-string per line
         snippet_content = '\n'.join(
             [
-                f'{i + start_line:6}\t{line}'
-                for i, line in enumerate(snippet_content.split('\n'))
+                '%6d\t%s' % numbered_line
+                for numbered_line in enumerate(snippet_content.split('\n'), start_line)
             ]
         )
         return (
@@ -1,10 +1,11 @@
 """History management for file edits with disk-based storage and memory constraints."""
 
+import hashlib
 import tempfile
 from pathlib import Path
 from typing import Optional
 
-from diskcache import Cache
+from diskcache import Cache, JSONDisk
 
 
 class FileHistoryManager:
@@ -22,53 +23,77 @@ class FileHistoryManager:
         Notes:
             - Each file's history is limited to the last N entries to conserve memory
             - The disk cache is limited to 500MB total to prevent excessive disk usage
+            - Entries are stored zlib-compressed, since file contents compress well
             - Older entries are automatically removed when limits are exceeded
         """
         self.max_history_per_file = max_history_per_file
         if history_dir is None:
             history_dir = Path(tempfile.mkdtemp(prefix='oh_editor_history_'))
-        self.cache = Cache(str(history_dir), size_limit=5e8)  # 500MB size limit
+        self.cache = Cache(
+            str(history_dir),
+            size_limit=5e8,  # 500MB size limit
+            disk=JSONDisk,
+            disk_compress_level=1,
+        )
 
     def add_history(self, file_path: Path, content: str):
-        """Add a new history entry for a file."""
+        """Add a new history entry for a file.
+
+        Content identical to the most recent entry is not stored again.
+        """
         key = str(file_path)
         # Get list of entry indices and counter for this file
         entries_key = f'{key}:entries'
         counter_key = f'{key}:counter'
-        entries = self.cache.get(entries_key, [])
-        counter = self.cache.get(counter_key, 0)
-
-        # Add new entry with monotonically increasing counter
-        entry_key = f'{key}:{counter}'
-        self.cache.set(entry_key, content)
-        entries.append(entry_key)
-        counter += 1
-
-        # Keep only last N entries
-        if len(entries) > self.max_history_per_file:
-            old_key = entries.pop(0)
-            self.cache.delete(old_key)
-
-        # Update entries list and counter
-        self.cache.set(entries_key, entries)
-        self.cache.set(counter_key, counter)
+        digest_key = f'{key}:digest'
+        digest = hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
+
+        # Apply all reads and writes of this entry in a single transaction
+        with self.cache.transact():
+            if self.cache.get(digest_key) == digest:
+                return
+            entries = self.cache.get(entries_key, [])
+            counter = self.cache.get(counter_key, 0)
+
+            # Add new entry with monotonically increasing counter
+            entry_key = f'{key}:{counter}'
+            self.cache.set(entry_key, content)
+            entries.append(entry_key)
+            counter += 1
+
+            # Keep only last N entries, dropping the whole overflow at once in
+            # case a previous manager on this directory used a higher limit
+            overflow = len(entries) - self.max_history_per_file
+            if overflow > 0:
+                for old_key in entries[:overflow]:
+                    self.cache.delete(old_key)
+                del entries[:overflow]
+
+            # Update entries list, counter and the digest of the newest entry
+            self.cache.set(entries_key, entries)
+            self.cache.set(counter_key, counter)
+            self.cache.set(digest_key, digest)
 
     def get_last_history(self, file_path: Path) -> Optional[str]:
         """Get the most recent history entry for a file."""
         key = str(file_path)
         entries_key = f'{key}:entries'
-        entries = self.cache.get(entries_key, [])
-
-        if not entries:
-            return None
 
-        # Get and remove last entry
-        last_key = entries.pop()
-        content = self.cache.get(last_key)
-        self.cache.delete(last_key)
-
-        # Update entries list
-        self.cache.set(entries_key, entries)
+        # Read and pop the last entry in a single transaction
+        with self.cache.transact():
+            entries = self.cache.get(entries_key, [])
+            if not entries:
+                return None
+
+            # Get and remove last entry; the digest of the new last entry is
+            # unknown
+            last_key = entries.pop()
+            content = self.cache.get(last_key)
+            self.cache.delete(last_key)
+            self.cache.delete(f'{key}:digest')
+
+            # Update entries list
+            self.cache.set(entries_key, entries)
         return content
 
     def clear_history(self, file_path: Path):
@@ -76,12 +101,12 @@ class FileHistoryManager:
         key = str(file_path)
         entries_key = f'{key}:entries'
         counter_key = f'{key}:counter'
-        entries = self.cache.get(entries_key, [])
-
-        # Delete all entries
-        for entry_key in entries:
-            self.cache.delete(entry_key)
 
-        # Delete entries list and counter
-        self.cache.delete(entries_key)
-        self.cache.delete(counter_key)
+        # Delete all entries, the entries list, counter and digest in a single
+        # transaction
+        with self.cache.transact():
+            for entry_key in self.cache.get(entries_key, []):
+                self.cache.delete(entry_key)
+            self.cache.delete(entries_key)
+            self.cache.delete(counter_key)
+            self.cache.delete(f'{key}:digest')
@@ -46,7 +46,9 @@ def flake_lint(filepath: str) -> list[LintResult]:
                 line_num = int(parts[1])
             except ValueError as e:
                 logger.warning(
-                    f'Error parsing flake8 output for line: {e}. Parsed parts: {parts}. Skipping...'
+                    'Error parsing flake8 output for line: %s. Parsed parts: %s. Skipping...',
+                    e,
+                    parts,
                 )
                 continue
 
@@ -58,7 +60,9 @@ def flake_lint(filepath: str) -> list[LintResult]:
                     parts[2].strip() + ' ' + _msg
                 )  # add the unparsed message to the original message
                 logger.warning(
-                    f'Error parsing flake8 output for column: {e}. Parsed parts: {parts}. Using default column 1.'
+                    'Error parsing flake8 output for column: %s. Parsed parts: %s. Using default column 1.',
+                    e,
+                    parts,
                 )
 
             results.append(
@@ -1,10 +1,19 @@
 import json
+import resource
 import tempfile
 from pathlib import Path
 
 import pytest
 
 
+@pytest.fixture(autouse=True)
+def restore_memory_limit():
+    """Restore the address-space limit after tests that lower it."""
+    limits = resource.getrlimit(resource.RLIMIT_AS)
+    yield
+    resource.setrlimit(resource.RLIMIT_AS, limits)
+
+
 @pytest.fixture
 def temp_file():
     """Create a temporary file for testing."""
@@ -2,10 +2,15 @@
 import json
 import re
 
-from openhands_aci.editor import file_editor
+from openhands_aci.editor import file_editor, file_editor_batch
 
 from .conftest import parse_result
 
+# Matches the output wrapper; the back-reference pairs opening and closing tags
+OUTPUT_TAG_PATTERN = re.compile(
+    r'<oh_aci_output_([0-9a-f]{32})>(.*?)</oh_aci_output_\1>', re.DOTALL
+)
+
 
 def test_file_editor_happy_path(temp_file):
     command = 'str_replace'
@@ -26,13 +31,9 @@ def test_file_editor_happy_path(temp_file):
     )
 
     # Extract the JSON content using a regular expression
-    match = re.search(
-        r'<oh_aci_output_[0-9a-f]{32}>(.*?)</oh_aci_output_[0-9a-f]{32}>',
-        result,
-        re.DOTALL,
-    )
+    match = OUTPUT_TAG_PATTERN.search(result)
     assert match, 'Output does not contain the expected <oh_aci_output_> tags in the correct format.'
-    result_dict = json.loads(match.group(1))
+    result_dict = json.loads(match.group(2))
 
     # Validate the formatted output in the result dictionary
     formatted_output = result_dict['formatted_output_and_error']
@@ -80,14 +81,10 @@ match = re.search(
     )
 
     # Ensure the content is extracted correctly
-    match = re.search(
-        r'<oh_aci_output_[0-9a-f]{32}>(.*?)</oh_aci_output_[0-9a-f]{32}>',
-        result,
-        re.DOTALL,
-    )
+    match = OUTPUT_TAG_PATTERN.search(result)
 
     assert match, 'Output does not contain the expected <oh_aci_output_> tags in the correct format.'
-    result_dict = json.loads(match.group(1))
+    result_dict = json.loads(match.group(2))
 
     # Validate the formatted output in the result dictionary
     formatted_output = result_dict['formatted_output_and_error']
@@ -212,3 +209,69 @@ def test_tab_expansion(temp_file):
     result_json = parse_result(result)
     # Tabs should be expanded in the output
     assert '        indented        line' in result_json['formatted_output_and_error']
+
+
+def test_file_editor_batch(tmp_path):
+    """Test that batched calls run against each file and keep their order."""
+    paths = [tmp_path / f'file{i}.txt' for i in range(4)]
+    for i, path in enumerate(paths):
+        path.write_text(f'content {i}\n')
+
+    results = file_editor_batch(
+        [
+            {
+                'command': 'str_replace',
+                'path': str(path),
+                'old_str': f'content {i}',
+                'new_str': f'edited {i}',
+            }
+            for i, path in enumerate(paths)
+        ]
+    )
+
+    assert len(results) == len(paths)
+    for i, (path, result) in enumerate(zip(paths, results)):
+        result_json = parse_result(result)
+        assert result_json['path'] == str(path)
+        assert 'has been edited' in result_json['formatted_output_and_error']
+        assert path.read_text() == f'edited {i}\n'
+
+
+def test_file_editor_batch_same_file_runs_in_order(tmp_path):
+    """Test that batched calls on one file neither interleave nor reorder."""
+    path = tmp_path / 'shared.txt'
+    path.write_text(''.join(f'line {i}\n' for i in range(50)))
+
+    calls = [
+        {
+            'command': 'str_replace',
+            'path': str(path),
+            'old_str': f'line {i}\n',
+            'new_str': f'edited {i}\n',
+        }
+        for i in range(50)
+    ]
+    # Each of these depends on the edit before it
+    calls.append(
+        {
+            'command': 'str_replace',
+            'path': str(path),
+            'old_str': 'edited 0\n',
+            'new_str': 'first\n',
+        }
+    )
+    calls.append(
+        {
+            'command': 'str_replace',
+            'path': str(path),
+            'old_str': 'first\n',
+            'new_str': 'second\n',
+        }
+    )
+    results = file_editor_batch(calls, max_workers=8)
+
+    for result in results:
+        assert 'has been edited' in parse_result(result)['formatted_output_and_error']
+    assert path.read_text() == 'second\n' + ''.join(
+        f'edited {i}\n' for i in range(1, 50)
+    )
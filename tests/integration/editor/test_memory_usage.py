@@ -95,7 +95,8 @@ def test_file_editor_memory_leak(temp_file):
     try:
         import resource
 
-        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, hard))
         print('Memory limit set successfully')
     except Exception as e:
         print(f'Warning: Could not set memory limit: {str(e)}')
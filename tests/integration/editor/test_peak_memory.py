@@ -1,5 +1,6 @@
 """Tests for peak memory usage in file operations."""
 
+import gc
 import os
 import resource
 import tempfile
@@ -10,11 +11,13 @@ import pytest
 
 from openhands_aci.editor import file_editor
 
+# Created once so each probe only re-reads the process statistics
+_PROCESS = psutil.Process(os.getpid())
+
 
 def get_memory_info():
     """Get current and peak memory usage in bytes."""
-    process = psutil.Process(os.getpid())
-    rss = process.memory_info().rss
+    rss = _PROCESS.memory_info().rss
     peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024  # Convert KB to bytes
     return {
         'rss': rss,
@@ -29,9 +32,9 @@ def create_test_file(path: Path, size_mb: float = 5.0):
     num_lines = int((size_mb * 1024 * 1024) // line_size)
 
     print(f"\nCreating test file with {num_lines} lines...")
-    with open(path, 'w') as f:
-        for i in range(num_lines):
-            f.write(f'Line {i}: ' + 'x' * (line_size - 10) + '\n')
+    line_template = 'Line %d: ' + 'x' * (line_size - 10) + '\n'
+    with open(path, 'w', buffering=1024 * 1024) as f:
+        f.writelines(line_template % i for i in range(num_lines))
 
     actual_size = os.path.getsize(path)
     print(f"File created, size: {actual_size / 1024 / 1024:.2f} MB")
@@ -47,7 +50,7 @@ def set_memory_limit(file_size: int, multiplier: float = 1.5):
         # Get current limits
         soft, hard = resource.getrlimit(resource.RLIMIT_AS)
         # Only set limit if it's higher than current usage
-        current_usage = psutil.Process().memory_info().rss
+        current_usage = _PROCESS.memory_info().rss
         if memory_limit > current_usage:
             resource.setrlimit(resource.RLIMIT_AS, (memory_limit, hard))
             print(f"Memory limit set to {memory_limit / 1024 / 1024:.2f} MB")
@@ -81,7 +84,6 @@ def test_str_replace_peak_memory():
         file_size = create_test_file(path)
 
         # Force Python to release file handles and clear buffers
-        import gc
         gc.collect()
 
         # Get initial memory usage
@@ -117,7 +119,6 @@ def test_insert_peak_memory():
         file_size = create_test_file(path)
 
         # Force Python to release file handles and clear buffers
-        import gc
         gc.collect()
 
         # Get initial memory usage
@@ -153,7 +154,6 @@ def test_view_peak_memory():
         file_size = create_test_file(path)
 
         # Force Python to release file handles and clear buffers
-        import gc
         gc.collect()
 
         # Get initial memory usage
@@ -188,7 +188,6 @@ def test_view_full_file_peak_memory():
         file_size = create_test_file(path, size_mb=5.0)  # Smaller file for full view
 
         # Force Python to release file handles and clear buffers
-        import gc
         gc.collect()
 
         # Get initial memory usage
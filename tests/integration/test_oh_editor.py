@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 import pytest
@@ -14,10 +15,23 @@ from openhands_aci.editor.prompts import (
 )
 from openhands_aci.editor.results import CLIResult, ToolResult
 
+# Three-line file contents using each carriage-return line ending
+CR_NEWLINE_CONTENTS = [
+    b'one\r\ntwo\r\nthree\r\n',  # CRLF line endings
+    b'one\rtwo\rthree\r',  # Lone CR line endings
+]
+
+
+@pytest.fixture(scope='module')
+def shared_editor():
+    # History is keyed by absolute path and every test writes its files under
+    # its own tmp_path, so one editor instance can safely serve the module
+    return OHEditor()
+
 
 @pytest.fixture
-def editor(tmp_path):
-    editor = OHEditor()
+def editor(shared_editor, tmp_path):
+    editor = shared_editor
     # Set up a temporary directory with test files
     test_file = tmp_path / 'test.txt'
     test_file.write_text('This is a test file.\nThis file is for testing purposes.')
@@ -25,8 +39,8 @@ def editor(tmp_path):
 
 
 @pytest.fixture
-def editor_python_file_with_tabs(tmp_path):
-    editor = OHEditor()
+def editor_python_file_with_tabs(shared_editor, tmp_path):
+    editor = shared_editor
     # Set up a temporary directory with test files
     test_file = tmp_path / 'test.py'
     test_file.write_text('def test():\n\tprint("Hello, World!")')
@@ -248,7 +262,6 @@ def test_insert_no_linting(editor):
     )
     assert isinstance(result, CLIResult)
     assert 'Inserted line' in test_file.read_text()
-    print(result.output)
     assert (
         result.output
         == f"""The file {test_file} has been edited. Here's the result of running `cat -n` on a snippet of the edited file:
@@ -270,7 +283,6 @@ def test_insert_with_linting(editor):
     )
     assert isinstance(result, CLIResult)
     assert 'Inserted line' in test_file.read_text()
-    print(result.output)
     assert (
         result.output
         == f"""The file {test_file} has been edited. Here's the result of running `cat -n` on a snippet of the edited file:
@@ -307,9 +319,11 @@ def test_insert_with_empty_string(editor):
         new_str='',
     )
     assert isinstance(result, CLIResult)
-    content = test_file.read_text().splitlines()
-    assert '' in content
-    assert len(content) == 3  # Original 2 lines plus empty line
+    # Original 2 lines plus empty line
+    assert (
+        test_file.read_text()
+        == 'This is a test file.\n\nThis file is for testing purposes.'
+    )
 
 
 def test_insert_with_none_new_str(editor):
@@ -374,6 +388,39 @@ def test_str_replace_new_str_and_old_str_same(editor):
     )
 
 
+def test_str_replace_new_str_and_old_str_same_after_expanding_tabs(editor):
+    editor, test_file = editor
+    # The file has no tabs, so the edit leaves it byte-for-byte unchanged
+    test_file.write_text('a       b\n')
+    result = editor(
+        command='str_replace',
+        path=str(test_file),
+        old_str='a\tb',
+        new_str='a       b',
+    )
+    assert isinstance(result, CLIResult)
+    assert f'No changes were made to {test_file}' in result.output
+    assert result.old_content == result.new_content == 'a       b\n'
+    assert test_file.read_text() == 'a       b\n'
+    assert editor._history_manager.get_last_history(test_file) is None
+
+
+def test_str_replace_same_after_expanding_tabs_rewrites_tabbed_file(editor):
+    editor, test_file = editor
+    # Tabs elsewhere in the file are expanded, so the edit changes the file
+    test_file.write_text('a\tb\nc\td\n')
+    result = editor(
+        command='str_replace',
+        path=str(test_file),
+        old_str='a\tb',
+        new_str='a       b',
+    )
+    assert isinstance(result, CLIResult)
+    assert 'has been edited' in result.output
+    assert test_file.read_text() == 'a       b\nc       d\n'
+    assert editor._history_manager.get_last_history(test_file) is not None
+
+
 def test_insert_missing_line_param(editor):
     editor, test_file = editor
     with pytest.raises(EditorToolParameterMissingError):
@@ -388,8 +435,8 @@ def test_undo_edit_no_history_error(editor):
         editor(command='undo_edit', path=str(empty_file))
 
 
-def test_view_directory_with_hidden_files(tmp_path):
-    editor = OHEditor()
+def test_view_directory_with_hidden_files(shared_editor, tmp_path):
+    editor = shared_editor
 
     # Create a directory with some test files
     test_dir = tmp_path / 'test_dir'
@@ -424,8 +471,8 @@ def test_view_directory_with_hidden_files(tmp_path):
     assert 'ls -la' in result.output  # Shows command to view hidden files
 
 
-def test_view_symlinked_directory(tmp_path):
-    editor = OHEditor()
+def test_view_symlinked_directory(shared_editor, tmp_path):
+    editor = shared_editor
 
     # Create a directory with some test files
     source_dir = tmp_path / 'source_dir'
@@ -454,20 +501,45 @@ def test_view_symlinked_directory(tmp_path):
     assert 'file3.txt' in result.output
 
 
+def test_view_directory_with_symlink_loop(shared_editor, tmp_path):
+    editor = shared_editor
+
+    # Create a directory containing a symlink back to itself
+    source_dir = tmp_path / 'source_dir'
+    source_dir.mkdir()
+    (source_dir / 'file1.txt').write_text('content1')
+    (source_dir / 'loop').symlink_to(source_dir)
+
+    # The loop is followed like any directory, down to the depth limit
+    result = editor(command='view', path=str(source_dir))
+    assert isinstance(result, CLIResult)
+    assert not result.error
+    assert (
+        result.output
+        == f"""Here's the files and directories up to 2 levels deep in {source_dir}, excluding hidden items:
+{source_dir}/
+{source_dir}/file1.txt
+{source_dir}/loop/
+{source_dir}/loop/file1.txt
+{source_dir}/loop/loop/"""
+    )
+
+
 def test_view_large_directory_with_truncation(editor, tmp_path):
     editor, _ = editor
     # Create a directory with many files to trigger truncation
     large_dir = tmp_path / 'large_dir'
     large_dir.mkdir()
+    # Only the names are listed, so empty files are enough
     for i in range(1000):  # 1000 files should trigger truncation
-        (large_dir / f'file_{i}.txt').write_text('content')
+        (large_dir / f'file_{i}.txt').touch()
 
     result = editor(command='view', path=str(large_dir))
     assert isinstance(result, CLIResult)
     assert DIRECTORY_CONTENT_TRUNCATED_NOTICE in result.output
 
 
-def test_view_directory_on_hidden_path(tmp_path):
+def test_view_directory_on_hidden_path(shared_editor, tmp_path):
     """Directory structure:
     .test_dir/
     ├── visible1.txt
@@ -480,7 +552,7 @@ def test_view_directory_on_hidden_path(tmp_path):
         └── .hidden3
     """
 
-    editor = OHEditor()
+    editor = shared_editor
 
     # Create a directory with test files at depth 1
     hidden_test_dir = tmp_path / '.hidden_test_dir'
@@ -529,14 +601,96 @@ def test_view_large_file_with_truncation(editor, tmp_path):
     editor, _ = editor
     # Create a large file to trigger truncation
     large_file = tmp_path / 'large_test.txt'
-    large_content = 'Line 1\n' * 16000  # 16000 lines should trigger truncation
-    large_file.write_text(large_content)
+    large_content = b'Line 1\n' * 16000  # 16000 lines should trigger truncation
+    large_file.write_bytes(large_content)
 
     result = editor(command='view', path=str(large_file))
     assert isinstance(result, CLIResult)
     assert FILE_CONTENT_TRUNCATED_NOTICE in result.output
 
 
+@pytest.mark.parametrize(
+    'content',
+    CR_NEWLINE_CONTENTS + [b'one\ntwo\nthree'],  # No trailing newline
+)
+def test_view_range_line_count(editor, content):
+    editor, test_file = editor
+    test_file.write_bytes(content)
+
+    result = editor(command='view', path=str(test_file), view_range=[2, 3])
+    assert '     2\ttwo\n     3\tthree' in result.output
+
+    with pytest.raises(EditorToolParameterInvalidError) as exc_info:
+        editor(command='view', path=str(test_file), view_range=[1, 4])
+    assert 'should be smaller than the number of lines in the file: `3`' in str(
+        exc_info.value.message
+    )
+
+    with pytest.raises(EditorToolParameterInvalidError) as exc_info:
+        editor(command='view', path=str(test_file), view_range=[4, 4])
+    assert 'should be within the range of lines of the file: [1, 3]' in str(
+        exc_info.value.message
+    )
+
+
+def test_view_range_line_count_with_late_carriage_returns(editor):
+    editor, test_file = editor
+    # The first CR only shows up after the first read chunk
+    test_file.write_bytes(b'x\n' * 40000 + b'y\rz\r')
+
+    result = editor(command='view', path=str(test_file), view_range=[40001, 40002])
+    assert '40001\ty\n 40002\tz' in result.output
+
+    with pytest.raises(EditorToolParameterInvalidError) as exc_info:
+        editor(command='view', path=str(test_file), view_range=[1, 40003])
+    assert 'number of lines in the file: `40002`' in str(exc_info.value.message)
+
+
+@pytest.mark.parametrize(
+    'content',
+    CR_NEWLINE_CONTENTS + [b'one\ntwo\nthree'],  # No trailing newline
+)
+def test_insert_line_count(editor, content):
+    editor, test_file = editor
+    test_file.write_bytes(content)
+
+    with pytest.raises(EditorToolParameterInvalidError) as exc_info:
+        editor(command='insert', path=str(test_file), insert_line=4, new_str='new')
+    assert 'within the range of lines of the file: [0, 3]' in str(
+        exc_info.value.message
+    )
+
+    result = editor(command='insert', path=str(test_file), insert_line=2, new_str='new')
+    assert result.new_content.split('\n')[:4] == ['one', 'two', 'new', 'three']
+    assert test_file.read_text().split('\n')[:4] == ['one', 'two', 'new', 'three']
+
+
+@pytest.mark.parametrize('content', CR_NEWLINE_CONTENTS)
+def test_view_full_file_translates_newlines(editor, content):
+    editor, test_file = editor
+    test_file.write_bytes(content)
+
+    result = editor(command='view', path=str(test_file))
+    assert '\r' not in result.output
+    assert '     1\tone\n     2\ttwo\n     3\tthree\n' in result.output
+
+
+@pytest.mark.parametrize('content', CR_NEWLINE_CONTENTS)
+def test_str_replace_translates_newlines(editor, content):
+    editor, test_file = editor
+    test_file.write_bytes(content)
+
+    result = editor(
+        command='str_replace', path=str(test_file), old_str='two\n', new_str='TWO\n'
+    )
+    assert result.old_content == 'one\ntwo\nthree\n'
+    assert result.new_content == 'one\nTWO\nthree\n'
+    # Written back with the platform's line separator, as text mode would
+    assert (
+        test_file.read_bytes() == 'one\nTWO\nthree\n'.replace('\n', os.linesep).encode()
+    )
+
+
 def test_validate_path_suggests_absolute_path(editor):
     editor, test_file = editor
     relative_path = test_file.name  # This is a relative path
@@ -78,6 +78,28 @@ def test_history_counter_persists():
         assert sorted(keys) == keys  # Keys should be sequential
 
 
+def test_lowered_history_limit_drops_all_overflow():
+    """Test that a lower limit trims entries left by a previous manager."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / 'test.txt'
+
+        manager1 = FileHistoryManager(
+            max_history_per_file=5, history_dir=Path(temp_dir)
+        )
+        for i in range(5):
+            manager1.add_history(path, f'content{i}')
+
+        manager2 = FileHistoryManager(
+            max_history_per_file=2, history_dir=Path(temp_dir)
+        )
+        manager2.add_history(path, 'content5')
+
+        entries = manager2.cache.get(f'{str(path)}:entries', [])
+        assert len(entries) == 2
+        assert manager2.cache.get(entries[0]) == 'content4'
+        assert manager2.cache.get(f'{str(path)}:0') is None
+
+
 def test_clear_history_resets_counter():
     """Test that clearing history resets the counter."""
     with tempfile.NamedTemporaryFile() as temp_file:
@@ -100,3 +122,27 @@ def test_clear_history_resets_counter():
         entries = manager.cache.get(f'{str(path)}:entries', [])
         assert len(entries) == 1
         assert entries[0].endswith(':0')  # First key should end with :0
+
+
+def test_duplicate_history_entry_is_skipped():
+    """Test that content identical to the last entry is not stored twice."""
+    with tempfile.NamedTemporaryFile() as temp_file:
+        path = Path(temp_file.name)
+        manager = FileHistoryManager()
+
+        manager.add_history(path, 'content1')
+        manager.add_history(path, 'content1')
+        entries = manager.cache.get(f'{str(path)}:entries', [])
+        assert len(entries) == 1
+
+        # Non-adjacent duplicates are still recorded
+        manager.add_history(path, 'content2')
+        manager.add_history(path, 'content1')
+        entries = manager.cache.get(f'{str(path)}:entries', [])
+        assert len(entries) == 3
+
+        # After popping, the popped content can be added again
+        assert manager.get_last_history(path) == 'content1'
+        manager.add_history(path, 'content1')
+        entries = manager.cache.get(f'{str(path)}:entries', [])
+        assert len(entries) == 3